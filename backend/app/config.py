@@ -9,6 +9,12 @@ class Settings:
     STELLAR_NETWORK: str = os.getenv("STELLAR_NETWORK", "testnet")
     CAMPAIGN_ACCOUNT_SECRET: str = os.getenv("CAMPAIGN_ACCOUNT_SECRET")
     DONOR_ACCOUNT_SECRET: str = os.getenv("DONOR_ACCOUNT_SECRET")
+    # Contas de canal: origem das transações para submissões em paralelo
+    CHANNEL_ACCOUNT_SECRETS: list[str] = [
+        secret.strip()
+        for secret in os.getenv("CHANNEL_ACCOUNT_SECRETS", "").split(",")
+        if secret.strip()
+    ]
 
     CAMPAIGN_GOAL_XLM: float = float(os.getenv("CAMPAIGN_GOAL_XLM", "100.0"))
     CAMPAIGN_TITLE: str = os.getenv("CAMPAIGN_TITLE", "Vaquinha Comunitária")
@@ -16,11 +22,27 @@ class Settings:
         "CAMPAIGN_DESCRIPTION", "Ajude nosso projeto!"
     )
 
+    # Controle de admissão do POST /donations
+    DONATION_MAX_IN_FLIGHT: int = int(os.getenv("DONATION_MAX_IN_FLIGHT", "1"))
+    DONATION_MAX_QUEUE: int = int(os.getenv("DONATION_MAX_QUEUE", "20"))
+    DONATION_QUEUE_TIMEOUT: float = float(os.getenv("DONATION_QUEUE_TIMEOUT", "10.0"))
+    DONATION_RATE_PER_SECOND: float = float(
+        os.getenv("DONATION_RATE_PER_SECOND", "0.5")
+    )
+    DONATION_RATE_BURST: int = int(os.getenv("DONATION_RATE_BURST", "5"))
+
+    # Índice local de doações (SQLite) alimentado pelo backfill
+    DONATION_INDEX_PATH: str = os.getenv("DONATION_INDEX_PATH", "donation_index.db")
+
     API_TITLE: str = "Stellar Crowdfunding System"
     API_VERSION: str = "1.0.0"
 
-    HORIZON_URL: str = "https://horizon-testnet.stellar.org"
-    NETWORK_PASSPHRASE: str = "Test SDF Network ; September 2015"
+    HORIZON_URL: str = os.getenv("HORIZON_URL", "https://horizon-testnet.stellar.org")
+    # Conexões HTTP mantidas com o Horizon (limita também os workers do backfill)
+    HORIZON_POOL_SIZE: int = int(os.getenv("HORIZON_POOL_SIZE", "32"))
+    NETWORK_PASSPHRASE: str = os.getenv(
+        "NETWORK_PASSPHRASE", "Test SDF Network ; September 2015"
+    )
 
 
 settings = Settings()
@@ -0,0 +1,120 @@
+import asyncio
+import logging
+import threading
+from typing import Dict, Optional
+
+from fastapi import HTTPException, Request
+
+from app.config import settings
+from app.models.schemas import DonationRecord
+from app.services.admissionService import AdmissionController
+from app.services.donationIndex import DonationIndex
+from app.services.stellarService import StellarCrowdfundingService
+
+logger = logging.getLogger(__name__)
+
+
+class ServiceContainer:
+    """Cria os serviços da aplicação sob demanda, no primeiro uso"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stellar_lock = asyncio.Lock()
+        self._stellar_service: Optional[StellarCrowdfundingService] = None
+        self._stellar_error: Optional[Exception] = None
+        self._admission_controller: Optional[AdmissionController] = None
+        self._donation_index: Optional[DonationIndex] = None
+
+        self.donations_cache: Dict[str, DonationRecord] = {}
+        # Um backfill por vez: execuções simultâneas gravariam faixas sobrepostas
+        self.backfill_lock = asyncio.Lock()
+
+    async def get_stellar_service(self) -> Optional[StellarCrowdfundingService]:
+        """Serviço Stellar, ou None se a configuração for inválida
+
+        A primeira criação importa stellar_sdk (centenas de ms) e roda fora do
+        event loop; requisições simultâneas aguardam a mesma criação.
+        """
+        async with self._stellar_lock:
+            if self._stellar_service is None and self._stellar_error is None:
+                try:
+                    self._stellar_service = await asyncio.to_thread(
+                        StellarCrowdfundingService
+                    )
+                    logger.info("Serviço de vaquinha inicializado")
+                except Exception as e:
+                    # Falha de configuração não se resolve sozinha: não tentar de novo
+                    logger.exception("Erro ao inicializar o serviço Stellar")
+                    self._stellar_error = e
+            return self._stellar_service
+
+    @property
+    def stellar_error(self) -> Optional[Exception]:
+        """Erro de configuração que impediu a criação do serviço Stellar"""
+        return self._stellar_error
+
+    @property
+    def admission_controller(self) -> AdmissionController:
+        with self._lock:
+            if self._admission_controller is None:
+                self._admission_controller = AdmissionController.from_settings()
+            return self._admission_controller
+
+    @property
+    def donation_index(self) -> DonationIndex:
+        with self._lock:
+            if self._donation_index is None:
+                self._donation_index = DonationIndex(settings.DONATION_INDEX_PATH)
+            return self._donation_index
+
+    def close(self):
+        with self._lock:
+            if self._stellar_service is not None:
+                self._stellar_service.close()
+                self._stellar_service = None
+            if self._donation_index is not None:
+                self._donation_index.close()
+                self._donation_index = None
+
+
+_container_lock = threading.Lock()
+
+
+def get_container(request: Request) -> ServiceContainer:
+    """Container do app; criado na hora se o lifespan não rodou (TestClient sem with)"""
+    state = request.app.state
+    container = getattr(state, "container", None)
+    if container is None:
+        with _container_lock:
+            container = getattr(state, "container", None)
+            if container is None:
+                container = state.container = ServiceContainer()
+    return container
+
+
+async def get_stellar_service(request: Request) -> StellarCrowdfundingService:
+    """Serviço Stellar; responde 503 com o erro de configuração se indisponível"""
+    container = get_container(request)
+    service = await container.get_stellar_service()
+    if service is None:
+        raise HTTPException(
+            status_code=503,
+            detail=f"Serviço Stellar não disponível: {container.stellar_error}",
+        )
+    return service
+
+
+async def get_admission_controller(request: Request) -> AdmissionController:
+    return get_container(request).admission_controller
+
+
+async def get_donation_index(request: Request) -> DonationIndex:
+    return get_container(request).donation_index
+
+
+async def get_donations_cache(request: Request) -> Dict[str, DonationRecord]:
+    return get_container(request).donations_cache
+
+
+async def get_backfill_lock(request: Request) -> asyncio.Lock:
+    return get_container(request).backfill_lock
@@ -1,14 +1,22 @@
-from typing import Dict
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.config import settings
-from app.models.schemas import DonationRecord
+from app.dependencies import ServiceContainer
 from app.routes import campaign, debug, donations
-from app.services.stellarService import StellarCrowdfundingService
 
-app = FastAPI(title=settings.API_TITLE, version=settings.API_VERSION)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Serviços são criados sob demanda pelo container, não no import
+    app.state.container = ServiceContainer()
+    yield
+    app.state.container.close()
+
+
+app = FastAPI(title=settings.API_TITLE, version=settings.API_VERSION, lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -18,21 +26,6 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-donations_cache: Dict[str, DonationRecord] = {}
-
-try:
-    stellar_service = StellarCrowdfundingService()
-    print("(Success) Serviço de vaquinha inicializado")
-
-    campaign.set_stellarService(stellar_service)
-    donations.set_stellarService(stellar_service)
-    donations.set_donations_cache(donations_cache)
-    debug.set_stellar_service(stellar_service)
-
-except Exception as e:
-    print(f"X Erro ao inicializar: {e}")
-    stellar_service = None
-
 app.include_router(campaign.router)
 app.include_router(donations.router)
 app.include_router(debug.router)
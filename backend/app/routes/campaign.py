@@ -1,27 +1,19 @@
 from datetime import datetime
 
 from app.config import settings
+from app.dependencies import get_stellar_service
 from app.models.schemas import CampaignInfo
 from app.services.stellarService import StellarCrowdfundingService
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 
 router = APIRouter(prefix="/campaign", tags=["campaign"])
 
-# Variável global para o serviço (será inicializada no main.py)
-stellarService: StellarCrowdfundingService = None
-
-
-def set_stellarService(service: StellarCrowdfundingService):
-    global stellarService
-    stellarService = service
-
 
 @router.get("/info", response_model=CampaignInfo)
-async def get_campaign_info():
+async def get_campaign_info(
+    stellarService: StellarCrowdfundingService = Depends(get_stellar_service),
+):
     """Retorna informações básicas da campanha"""
-    if not stellarService:
-        raise HTTPException(status_code=500, detail="Serviço não disponível")
-
     try:
         stats = await stellarService.get_campaign_stats()
 
@@ -1,19 +1,24 @@
 import asyncio
+from typing import Optional
 
 from app.config import settings
+from app.dependencies import (
+    get_admission_controller,
+    get_backfill_lock,
+    get_donation_index,
+    get_stellar_service,
+)
+from app.services.admissionService import AdmissionController
+from app.services.backfillService import run_backfill
+from app.services.donationIndex import DonationIndex
+from app.services.loadGenerator import run_load
 from app.services.stellarService import StellarCrowdfundingService
 from app.utils.helpers import create_donation_memo
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 
 router = APIRouter(prefix="/debug", tags=["debug"])
 
-# Serviço será inicializado no main.py
-stellar_service: StellarCrowdfundingService = None
-
-
-def set_stellar_service(service: StellarCrowdfundingService):
-    global stellar_service
-    stellar_service = service
+MAX_SIMULATED_DONATIONS = 10_000
 
 
 @router.get("/memo/{donor_name}/{amount}")
@@ -33,11 +38,10 @@ async def test_memo(donor_name: str, amount: float):
 
 
 @router.get("/account")
-async def debug_account():
+async def debug_account(
+    stellar_service: StellarCrowdfundingService = Depends(get_stellar_service),
+):
     """Informações de debug das contas"""
-    if not stellar_service:
-        return {"error": "Serviço não disponível"}
-
     try:
         campaign_info = stellar_service.get_account_info(
             stellar_service.campaign_keypair.public_key
@@ -59,46 +63,83 @@ async def debug_account():
         return {"error": f"Erro ao obter informações: {e}"}
 
 
-@router.post("/simulate/{count}")
-async def simulate_donations(count: int):
-    """Simula doações para teste (máximo 5)"""
-    if count > 5:
-        raise HTTPException(status_code=400, detail="Máximo 5 doações simuladas")
+@router.get("/admission")
+async def admission_stats(
+    admission_controller: AdmissionController = Depends(get_admission_controller),
+):
+    """Ocupação do controle de admissão de doações"""
+    return admission_controller.stats()
 
-    if not stellar_service:
-        raise HTTPException(status_code=500, detail="Serviço não disponível")
 
-    fake_donations = [
-        ("Ana Silva", 5.5),
-        ("Carlos Santos", 12.0),
-        ("Maria Oliveira", 8.75),
-        ("João Pedro", 15.25),
-        ("Lucia Costa", 20.0),
-    ]
+@router.post("/simulate/{count}")
+async def simulate_donations(
+    count: int,
+    concurrency: int = 1,
+    rate: float = 0.0,
+    distribution: str = "uniform",
+    min_amount: float = 1.0,
+    max_amount: float = 10.0,
+    seed: Optional[int] = None,
+    stellar_service: StellarCrowdfundingService = Depends(get_stellar_service),
+):
+    """Gera carga de doações sintéticas e reporta vazão, latência e falhas"""
+    if count < 1 or count > MAX_SIMULATED_DONATIONS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"count deve estar entre 1 e {MAX_SIMULATED_DONATIONS}",
+        )
+    if concurrency < 1:
+        raise HTTPException(status_code=400, detail="concurrency mínima: 1")
+    if rate < 0:
+        raise HTTPException(status_code=400, detail="rate não pode ser negativa")
+    if min_amount > max_amount:
+        raise HTTPException(
+            status_code=400, detail="min_amount não pode ser maior que max_amount"
+        )
 
-    results = []
+    try:
+        report = await run_load(
+            stellar_service,
+            count=count,
+            concurrency=concurrency,
+            rate=rate,
+            distribution=distribution,
+            min_amount=min_amount,
+            max_amount=max_amount,
+            seed=seed,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    report["message"] = f"{report['succeeded']} doações simuladas com sucesso"
+    return report
+
+
+@router.post("/backfill")
+async def backfill_donations(
+    workers: int = 4,
+    ranges_per_worker: int = 4,
+    stellar_service: StellarCrowdfundingService = Depends(get_stellar_service),
+    donation_index: DonationIndex = Depends(get_donation_index),
+    backfill_lock: asyncio.Lock = Depends(get_backfill_lock),
+):
+    """Sincroniza o histórico da campanha no índice local (faixas em paralelo)"""
+    if workers < 1 or workers > settings.HORIZON_POOL_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"workers deve estar entre 1 e {settings.HORIZON_POOL_SIZE}",
+        )
 
-    for i in range(min(count, len(fake_donations))):
-        name, amount = fake_donations[i]
+    if backfill_lock.locked():
+        raise HTTPException(status_code=409, detail="Backfill já em andamento")
 
+    async with backfill_lock:
         try:
-            stats = await stellar_service.get_campaign_stats()
-            if not stats["is_active"]:
-                break
-
-            tx_hash = await stellar_service.process_donation(name, amount)
-            results.append(
-                {"donor": name, "amount": amount, "hash": tx_hash, "success": True}
+            return await run_backfill(
+                stellar_service,
+                donation_index,
+                workers=workers,
+                ranges_per_worker=ranges_per_worker,
             )
-
-            await asyncio.sleep(1)
-
         except Exception as e:
-            results.append(
-                {"donor": name, "amount": amount, "error": str(e), "success": False}
-            )
-
-    return {
-        "simulated_donations": results,
-        "message": f"{len([r for r in results if r['success']])} doações simuladas com sucesso",
-    }
+            raise HTTPException(status_code=500, detail=f"Erro no backfill: {e}")
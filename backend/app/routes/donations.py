@@ -1,40 +1,54 @@
+import csv
+import io
+import json
 from datetime import datetime
-from typing import Dict
+from typing import AsyncIterator, Dict, Literal, Optional
 
 from app.config import settings
+from app.dependencies import (
+    ServiceContainer,
+    get_admission_controller,
+    get_container,
+    get_donations_cache,
+    get_stellar_service,
+)
 from app.models.schemas import (
     DonationRecord,
     DonationRequest,
     DonationResponse,
 )
+from app.services.admissionService import AdmissionController, AdmissionRejected
 from app.services.stellarService import StellarCrowdfundingService
 from app.utils.helpers import create_donation_memo, validate_donation_input
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
 
 router = APIRouter(prefix="/donations", tags=["donations"])
 
-# Cache de doações e serviço (serão inicializados no main.py)
-donations_cache: Dict[str, DonationRecord] = {}
-stellarService: StellarCrowdfundingService = None
-
-
-def set_stellarService(service: StellarCrowdfundingService):
-    global stellarService
-    stellarService = service
+EXPORT_FIELDS = [
+    "cursor",
+    "operation_id",
+    "donor_name",
+    "amount",
+    "transaction_hash",
+    "timestamp",
+    "memo",
+]
 
-
-def set_donations_cache(cache: Dict[str, DonationRecord]):
-    global donations_cache
-    donations_cache = cache
+# Cursores são paging tokens do Horizon (int64); o índice os grava como INTEGER
+MAX_CURSOR = 2**63 - 1
 
 
 @router.post("/", response_model=DonationResponse)
-async def make_donation(donation_request: DonationRequest):
+async def make_donation(
+    donation_request: DonationRequest,
+    request: Request,
+    stellarService: StellarCrowdfundingService = Depends(get_stellar_service),
+    admissionController: AdmissionController = Depends(get_admission_controller),
+    donations_cache: Dict[str, DonationRecord] = Depends(get_donations_cache),
+):
     """Processa uma nova doação"""
 
-    if not stellarService:
-        raise HTTPException(status_code=500, detail="Serviço Stellar não disponível")
-
     donor_name = donation_request.donor_name.strip()
     amount = donation_request.amount
 
@@ -43,6 +57,26 @@ async def make_donation(donation_request: DonationRequest):
     if not is_valid:
         raise HTTPException(status_code=400, detail=error_msg)
 
+    client_id = request.client.host if request.client else "unknown"
+    try:
+        async with admissionController.admit(client_id):
+            return await _process_donation(
+                stellarService, donations_cache, donor_name, amount
+            )
+    except AdmissionRejected as e:
+        raise HTTPException(
+            status_code=e.status_code,
+            detail=e.detail,
+            headers={"Retry-After": str(e.retry_after)},
+        )
+
+
+async def _process_donation(
+    stellarService: StellarCrowdfundingService,
+    donations_cache: Dict[str, DonationRecord],
+    donor_name: str,
+    amount: float,
+) -> DonationResponse:
     try:
         stats = await stellarService.get_campaign_stats()
 
@@ -92,11 +126,10 @@ async def make_donation(donation_request: DonationRequest):
 
 
 @router.get("/")
-async def get_donations():
+async def get_donations(
+    stellarService: StellarCrowdfundingService = Depends(get_stellar_service),
+):
     """Retorna todas as doações da campanha"""
-    if not stellarService:
-        raise HTTPException(status_code=500, detail="Serviço não disponível")
-
     try:
         stats = await stellarService.get_campaign_stats()
         return {
@@ -112,11 +145,11 @@ async def get_donations():
 
 
 @router.get("/top")
-async def get_top_donors(limit: int = 10):
+async def get_top_donors(
+    limit: int = 10,
+    stellarService: StellarCrowdfundingService = Depends(get_stellar_service),
+):
     """Retorna maiores doadores"""
-    if not stellarService:
-        raise HTTPException(status_code=500, detail="Serviço não disponível")
-
     try:
         stats = await stellarService.get_campaign_stats()
         donations = stats["donations"]
@@ -148,3 +181,119 @@ async def get_top_donors(limit: int = 10):
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Erro ao buscar top doadores: {e}")
+
+
+@router.get("/export")
+async def export_donations(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    since: Optional[str] = None,
+    source: Literal["horizon", "index"] = "horizon",
+    stellarService: StellarCrowdfundingService = Depends(get_stellar_service),
+    container: ServiceContainer = Depends(get_container),
+):
+    """Exporta o histórico completo de doações em streaming (NDJSON ou CSV)
+
+    Cada registro traz o campo `cursor`; passe o último recebido em `since`
+    para retomar ou continuar a exportação de forma incremental. Com
+    `source=index`, lê do índice local preenchido por /debug/backfill.
+
+    Se uma página falhar no meio do envio, a exportação termina com um
+    registro de erro (NDJSON) ou uma linha `# ERRO` (CSV) indicando o cursor
+    para retomar.
+    """
+    since = _parse_cursor(since)
+
+    if source == "index":
+        donations = container.donation_index.aiter_donations(
+            stellarService.campaign_keypair.public_key, since=since
+        )
+    else:
+        donations = stellarService.iter_donations(since=since)
+
+    # A primeira página é buscada antes dos headers: falhas viram 400/502
+    # em vez de um 200 com corpo vazio
+    first = await _fetch_first(donations)
+    records = _chain_first(first, donations)
+
+    if format == "csv":
+        return StreamingResponse(
+            _stream_csv(records, since),
+            media_type="text/csv",
+            headers={"Content-Disposition": "attachment; filename=donations.csv"},
+        )
+
+    return StreamingResponse(
+        _stream_ndjson(records, since), media_type="application/x-ndjson"
+    )
+
+
+def _parse_cursor(since: Optional[str]) -> Optional[str]:
+    """Valida o cursor `since` (inteiro entre 0 e 2**63 - 1) ou responde 400"""
+    if not since:
+        return None
+    if not (since.isascii() and since.isdigit()) or int(since) > MAX_CURSOR:
+        raise HTTPException(status_code=400, detail="Cursor inválido")
+    return str(int(since))
+
+
+async def _fetch_first(donations: AsyncIterator[Dict]) -> Optional[Dict]:
+    try:
+        return await donations.__anext__()
+    except StopAsyncIteration:
+        return None
+    except Exception as e:
+        # Erros do Horizon (stellar_sdk) trazem status e detail
+        message = getattr(e, "detail", None) or str(e)
+        if getattr(e, "status", None) == 400:
+            raise HTTPException(status_code=400, detail=f"Cursor inválido: {message}")
+        raise HTTPException(
+            status_code=502, detail=f"Erro ao buscar histórico de doações: {message}"
+        )
+
+
+async def _chain_first(
+    first: Optional[Dict], donations: AsyncIterator[Dict]
+) -> AsyncIterator[Dict]:
+    if first is None:
+        return
+    yield first
+    async for donation in donations:
+        yield donation
+
+
+async def _stream_ndjson(
+    donations: AsyncIterator[Dict], since: Optional[str]
+) -> AsyncIterator[str]:
+    cursor = since
+    try:
+        async for donation in donations:
+            cursor = donation["cursor"]
+            yield json.dumps(donation, ensure_ascii=False) + "\n"
+    except Exception as e:
+        print(f"Erro na exportação de doações: {e}")
+        error = {"error": f"Exportação incompleta: {e}", "resume_cursor": cursor}
+        yield json.dumps(error, ensure_ascii=False) + "\n"
+
+
+async def _stream_csv(
+    donations: AsyncIterator[Dict], since: Optional[str]
+) -> AsyncIterator[str]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS)
+    cursor = since
+
+    writer.writeheader()
+    try:
+        async for donation in donations:
+            cursor = donation["cursor"]
+            writer.writerow(donation)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+    except Exception as e:
+        print(f"Erro na exportação de doações: {e}")
+        error = str(e).replace("\n", " ")
+        buffer.write(f"# ERRO: exportação incompleta ({error}); since={cursor}\r\n")
+
+    if buffer.tell():
+        yield buffer.getvalue()
@@ -0,0 +1,167 @@
+import asyncio
+import math
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, Optional
+
+from app.config import settings
+
+# Limite de clientes rastreados antes de descartar buckets ociosos
+MAX_TRACKED_CLIENTS = 10_000
+
+
+class AdmissionRejected(Exception):
+    """Requisição recusada pelo controle de admissão"""
+
+    def __init__(self, status_code: int, detail: str, retry_after: float):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+        self.retry_after = max(1, math.ceil(retry_after))
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = float(burst)
+        self.tokens = float(burst)
+        self.updated_at = time.monotonic()
+
+    def _refill(self, now: float):
+        elapsed = now - self.updated_at
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+        self.updated_at = now
+
+    def try_consume(self) -> float:
+        """Consome um token; retorna 0 se aceito ou segundos até o próximo token"""
+        now = time.monotonic()
+        self._refill(now)
+
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+
+        return (1 - self.tokens) / self.rate
+
+    def refund(self):
+        """Devolve um token consumido por uma requisição que não foi executada"""
+        self.tokens = min(self.capacity, self.tokens + 1)
+
+    def is_full(self) -> bool:
+        self._refill(time.monotonic())
+        return self.tokens >= self.capacity
+
+
+class AdmissionController:
+    """Limita submissões simultâneas, fila de espera e taxa por cliente"""
+
+    def __init__(
+        self,
+        max_in_flight: int,
+        max_queue: int,
+        queue_timeout: float,
+        rate_per_second: float,
+        rate_burst: int,
+    ):
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight deve ser pelo menos 1")
+
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.rate_per_second = rate_per_second
+        self.rate_burst = max(1, rate_burst)
+
+        self._semaphore = asyncio.Semaphore(max_in_flight)
+        self._in_flight = 0
+        self._waiting = 0
+        self._buckets: Dict[str, TokenBucket] = {}
+
+    @classmethod
+    def from_settings(cls) -> "AdmissionController":
+        return cls(
+            max_in_flight=settings.DONATION_MAX_IN_FLIGHT,
+            max_queue=settings.DONATION_MAX_QUEUE,
+            queue_timeout=settings.DONATION_QUEUE_TIMEOUT,
+            rate_per_second=settings.DONATION_RATE_PER_SECOND,
+            rate_burst=settings.DONATION_RATE_BURST,
+        )
+
+    def _check_rate(self, client_id: str) -> Optional[TokenBucket]:
+        """Consome um token do cliente; retorna o bucket usado (None sem limite)"""
+        if self.rate_per_second <= 0:
+            return None
+
+        bucket = self._buckets.get(client_id)
+        if bucket is None:
+            if len(self._buckets) >= MAX_TRACKED_CLIENTS:
+                self._evict_idle_buckets()
+            bucket = TokenBucket(self.rate_per_second, self.rate_burst)
+            self._buckets[client_id] = bucket
+
+        wait = bucket.try_consume()
+        if wait > 0:
+            raise AdmissionRejected(
+                status_code=429,
+                detail="Muitas doações em sequência. Tente novamente em instantes.",
+                retry_after=wait,
+            )
+        return bucket
+
+    def _evict_idle_buckets(self):
+        # Buckets cheios equivalem a clientes novos, podem ser descartados
+        idle = [key for key, bucket in self._buckets.items() if bucket.is_full()]
+        for key in idle:
+            del self._buckets[key]
+
+    async def _acquire(self):
+        # Ocupação contada de forma síncrona: o semáforo só é adquirido no
+        # próximo ciclo do loop, então locked() não enxerga chegadas simultâneas
+        if self._in_flight + self._waiting >= self.max_in_flight + self.max_queue:
+            raise AdmissionRejected(
+                status_code=503,
+                detail="Serviço sobrecarregado. Tente novamente em instantes.",
+                retry_after=self.queue_timeout,
+            )
+
+        self._waiting += 1
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            raise AdmissionRejected(
+                status_code=503,
+                detail="Tempo de espera na fila esgotado. Tente novamente.",
+                retry_after=self.queue_timeout,
+            )
+        finally:
+            self._waiting -= 1
+
+        self._in_flight += 1
+
+    @asynccontextmanager
+    async def admit(self, client_id: str):
+        """Reserva uma vaga de submissão para o cliente ou levanta AdmissionRejected"""
+        bucket = self._check_rate(client_id)
+        try:
+            await self._acquire()
+        except AdmissionRejected:
+            # Recusada por capacidade, não pelo cliente: não gasta sua cota
+            if bucket is not None:
+                bucket.refund()
+            raise
+
+        try:
+            yield
+        finally:
+            self._in_flight -= 1
+            self._semaphore.release()
+
+    def stats(self) -> Dict:
+        """Ocupação atual das vagas e da fila de espera"""
+        return {
+            "in_flight": self._in_flight,
+            "waiting": self._waiting,
+            "max_in_flight": self.max_in_flight,
+            "max_queue": self.max_queue,
+            "tracked_clients": len(self._buckets),
+        }
@@ -0,0 +1,237 @@
+import argparse
+import asyncio
+import json
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import partial
+from typing import Dict, List
+
+from app.config import settings
+from app.services.donationIndex import DonationIndex
+from app.services.stellarService import StellarCrowdfundingService
+
+# O paging token do Horizon é um TOID: o ledger ocupa os 32 bits mais altos
+LEDGER_SHIFT = 32
+
+PAGE_RETRIES = 3
+
+
+def ledger_of(paging_token: str) -> int:
+    return int(paging_token) >> LEDGER_SHIFT
+
+
+def ledger_cursor(ledger: int) -> str:
+    """Cursor que antecede todas as operações do ledger informado"""
+    return str(ledger << LEDGER_SHIFT)
+
+
+def split_ledger_range(start: int, end: int, parts: int) -> List[Dict]:
+    """Divide [start, end) em até `parts` faixas contíguas de ledgers"""
+    parts = max(1, min(parts, end - start))
+    size, extra = divmod(end - start, parts)
+
+    ranges = []
+    lower = start
+    for i in range(parts):
+        upper = lower + size + (1 if i < extra else 0)
+        ranges.append(
+            {"start_ledger": lower, "end_ledger": upper, "cursor": ledger_cursor(lower)}
+        )
+        lower = upper
+    return ranges
+
+
+async def _plan_ranges(
+    service: StellarCrowdfundingService,
+    index: DonationIndex,
+    account: str,
+    parts: int,
+    executor: Executor,
+) -> int:
+    """Registra faixas ainda não cobertas; retorna o último ledger com pagamento"""
+    loop = asyncio.get_running_loop()
+    first = await service.get_payments_page(None, 1, executor=executor)
+    latest = await service.get_payments_page(None, 1, desc=True, executor=executor)
+    if not first:
+        return 0
+
+    first_ledger = ledger_of(first[0]["paging_token"])
+    last_ledger = ledger_of(latest[0]["paging_token"])
+
+    existing = await loop.run_in_executor(executor, index.get_ranges, account)
+    if existing:
+        # Histórico já particionado: só o trecho novo vira faixas adicionais
+        first_ledger = max(r["end_ledger"] for r in existing)
+
+    if first_ledger <= last_ledger:
+        ranges = split_ledger_range(first_ledger, last_ledger + 1, parts)
+        await loop.run_in_executor(executor, index.add_ranges, account, ranges)
+
+    return last_ledger
+
+
+async def run_backfill(
+    service: StellarCrowdfundingService,
+    index: DonationIndex,
+    workers: int = 4,
+    ranges_per_worker: int = 4,
+    page_size: int = 200,
+) -> Dict:
+    """Sincroniza o histórico da campanha no índice, com faixas de ledgers em paralelo
+
+    Cada faixa guarda seu cursor a cada página; uma execução interrompida
+    retoma exatamente de onde parou. Execuções seguintes cobrem apenas os
+    ledgers novos.
+
+    Buscas no Horizon e gravações no índice rodam em um pool de threads
+    próprio, com uma thread por worker, sem disputar o executor padrão.
+    `workers` é limitado a HORIZON_POOL_SIZE (conexões HTTP disponíveis).
+    """
+    if workers < 1:
+        raise ValueError("workers deve ser pelo menos 1")
+    workers = min(workers, settings.HORIZON_POOL_SIZE)
+
+    with ThreadPoolExecutor(
+        max_workers=workers, thread_name_prefix="backfill"
+    ) as executor:
+        return await _run_backfill(
+            service, index, workers, ranges_per_worker, page_size, executor
+        )
+
+
+async def _run_backfill(
+    service: StellarCrowdfundingService,
+    index: DonationIndex,
+    workers: int,
+    ranges_per_worker: int,
+    page_size: int,
+    executor: Executor,
+) -> Dict:
+    account = service.campaign_keypair.public_key
+    loop = asyncio.get_running_loop()
+    started_at = loop.time()
+
+    last_ledger = await _plan_ranges(
+        service, index, account, workers * max(1, ranges_per_worker), executor
+    )
+    all_ranges = await loop.run_in_executor(executor, index.get_ranges, account)
+    pending = [r for r in all_ranges if not r["done"]]
+
+    totals = {"pages": 0, "operations": 0, "donations": 0, "inserted": 0}
+    completed = 0
+    errors: List[str] = []
+
+    queue: asyncio.Queue = asyncio.Queue()
+    for r in pending:
+        queue.put_nowait(r)
+
+    async def fetch_page(cursor: str) -> list:
+        for attempt in range(PAGE_RETRIES):
+            try:
+                return await service.get_payments_page(
+                    cursor, page_size, executor=executor
+                )
+            except Exception:
+                if attempt == PAGE_RETRIES - 1:
+                    raise
+                await asyncio.sleep(2**attempt)
+
+    async def backfill_range(r: Dict):
+        cursor = r["cursor"]
+        end_token = r["end_ledger"] << LEDGER_SHIFT
+
+        while True:
+            records = await fetch_page(cursor)
+            in_range = [rec for rec in records if int(rec["paging_token"]) < end_token]
+            done = len(in_range) < len(records) or len(records) < page_size
+
+            donations = []
+            for record in in_range:
+                donation = service.payment_to_donation(record)
+                if donation:
+                    donations.append(donation)
+            if in_range:
+                cursor = in_range[-1]["paging_token"]
+
+            inserted = await loop.run_in_executor(
+                executor,
+                partial(
+                    index.add_donations,
+                    account,
+                    donations,
+                    checkpoint={
+                        "start_ledger": r["start_ledger"],
+                        "cursor": cursor,
+                        "done": done,
+                    },
+                ),
+            )
+
+            # Só depois do await: outras faixas atualizam os totais enquanto isso
+            totals["pages"] += 1
+            totals["operations"] += len(in_range)
+            totals["donations"] += len(donations)
+            totals["inserted"] += inserted
+
+            if done:
+                return
+
+    async def worker():
+        nonlocal completed
+
+        while not queue.empty():
+            r = queue.get_nowait()
+            try:
+                await backfill_range(r)
+                completed += 1
+            except Exception as e:
+                errors.append(f"Faixa {r['start_ledger']}-{r['end_ledger']}: {e}")
+
+    await asyncio.gather(*(worker() for _ in range(min(workers, len(pending)))))
+
+    return {
+        "account": account,
+        "workers": workers,
+        "last_ledger": last_ledger,
+        "ranges_total": len(all_ranges),
+        "ranges_pending": len(pending),
+        "ranges_completed": completed,
+        "ranges_failed": len(errors),
+        "pages_fetched": totals["pages"],
+        "operations_scanned": totals["operations"],
+        "donations_found": totals["donations"],
+        "donations_inserted": totals["inserted"],
+        "duplicates_skipped": totals["donations"] - totals["inserted"],
+        "indexed_total": await loop.run_in_executor(executor, index.count, account),
+        "duration_seconds": round(loop.time() - started_at, 3),
+        "errors": errors,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill do índice de doações")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--ranges-per-worker", type=int, default=4)
+    parser.add_argument("--index", default=settings.DONATION_INDEX_PATH)
+    args = parser.parse_args()
+
+    async def run():
+        service = StellarCrowdfundingService()
+        index = DonationIndex(args.index)
+        try:
+            return await run_backfill(
+                service,
+                index,
+                workers=args.workers,
+                ranges_per_worker=args.ranges_per_worker,
+            )
+        finally:
+            index.close()
+
+    report = asyncio.run(run())
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    if report["errors"]:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+import asyncio
+import sqlite3
+import threading
+from typing import AsyncIterator, Dict, List, Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS donations (
+    operation_id TEXT PRIMARY KEY,
+    account TEXT NOT NULL,
+    paging_token INTEGER NOT NULL,
+    donor_name TEXT NOT NULL,
+    amount REAL NOT NULL,
+    transaction_hash TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    memo TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS donations_account_token
+    ON donations (account, paging_token);
+
+CREATE TABLE IF NOT EXISTS backfill_ranges (
+    account TEXT NOT NULL,
+    start_ledger INTEGER NOT NULL,
+    end_ledger INTEGER NOT NULL,
+    cursor TEXT,
+    done INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (account, start_ledger)
+);
+"""
+
+
+class DonationIndex:
+    """Índice local de doações (SQLite), deduplicado por ID de operação"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.executescript(SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def add_donations(
+        self,
+        account: str,
+        donations: List[Dict],
+        checkpoint: Optional[Dict] = None,
+    ) -> int:
+        """Insere doações ignorando duplicadas; retorna quantas eram novas
+
+        Se `checkpoint` for informado, o progresso da faixa é gravado na mesma
+        transação, para que uma retomada nunca pule nem repita uma página.
+        """
+        rows = [
+            (
+                d["operation_id"],
+                account,
+                int(d["cursor"]),
+                d["donor_name"],
+                d["amount"],
+                d["transaction_hash"],
+                d["timestamp"],
+                d["memo"] or "",
+            )
+            for d in donations
+        ]
+
+        with self._lock, self._conn:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO donations VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows
+            )
+            inserted = self._conn.total_changes - before
+
+            if checkpoint:
+                self._conn.execute(
+                    "UPDATE backfill_ranges SET cursor = ?, done = ? "
+                    "WHERE account = ? AND start_ledger = ?",
+                    (
+                        checkpoint["cursor"],
+                        int(checkpoint["done"]),
+                        account,
+                        checkpoint["start_ledger"],
+                    ),
+                )
+
+        return inserted
+
+    def get_donations_page(
+        self, account: str, since: Optional[str] = None, limit: int = 500
+    ) -> List[Dict]:
+        """Lote de doações posteriores ao cursor, em ordem cronológica"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM donations WHERE account = ? AND paging_token > ? "
+                "ORDER BY paging_token LIMIT ?",
+                (account, int(since) if since else -1, limit),
+            ).fetchall()
+
+        return [
+            {
+                "cursor": str(row["paging_token"]),
+                "operation_id": row["operation_id"],
+                "donor_name": row["donor_name"],
+                "amount": row["amount"],
+                "transaction_hash": row["transaction_hash"],
+                "timestamp": row["timestamp"],
+                "memo": row["memo"],
+            }
+            for row in rows
+        ]
+
+    async def aiter_donations(
+        self, account: str, since: Optional[str] = None, batch_size: int = 500
+    ) -> AsyncIterator[Dict]:
+        """Percorre as doações em ordem cronológica, lendo cada lote fora do event loop"""
+        while True:
+            donations = await asyncio.to_thread(
+                self.get_donations_page, account, since, batch_size
+            )
+            for donation in donations:
+                yield donation
+
+            if len(donations) < batch_size:
+                return
+            since = donations[-1]["cursor"]
+
+    def count(self, account: str) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM donations WHERE account = ?", (account,)
+            ).fetchone()[0]
+
+    def get_ranges(self, account: str) -> List[Dict]:
+        """Faixas de ledgers do backfill e seus checkpoints"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT start_ledger, end_ledger, cursor, done FROM backfill_ranges "
+                "WHERE account = ? ORDER BY start_ledger",
+                (account,),
+            ).fetchall()
+        return [dict(row, done=bool(row["done"])) for row in rows]
+
+    def add_ranges(self, account: str, ranges: List[Dict]):
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO backfill_ranges "
+                "(account, start_ledger, end_ledger, cursor, done) "
+                "VALUES (?, ?, ?, ?, 0)",
+                [
+                    (account, r["start_ledger"], r["end_ledger"], r["cursor"])
+                    for r in ranges
+                ],
+            )
@@ -0,0 +1,209 @@
+import argparse
+import asyncio
+import json
+import random
+import re
+import time
+from collections import Counter
+from typing import Callable, Dict, List, Optional
+
+from app.services.stellarService import StellarCrowdfundingService
+
+AMOUNT_DISTRIBUTIONS = ("fixed", "uniform", "exponential")
+
+# Limites aceitos por validate_donation_input
+MIN_AMOUNT = 0.1
+MAX_AMOUNT = 1000.0
+
+RESULT_CODE_PATTERN = re.compile(r"\b((?:tx|op)_[a-z_]+)\b")
+
+
+def synthetic_donor_name(index: int) -> str:
+    """Nome sintético de doador (cabe no memo de 28 bytes)"""
+    return f"Carga {index:06d}"
+
+
+def make_amount_sampler(
+    distribution: str,
+    min_amount: float,
+    max_amount: float,
+    rng: random.Random,
+) -> Callable[[], float]:
+    """Cria um gerador de valores de doação para a distribuição pedida"""
+    if distribution not in AMOUNT_DISTRIBUTIONS:
+        raise ValueError(
+            f"Distribuição inválida: {distribution} "
+            f"(use {', '.join(AMOUNT_DISTRIBUTIONS)})"
+        )
+
+    low = max(MIN_AMOUNT, min_amount)
+    high = min(MAX_AMOUNT, max(max_amount, low))
+
+    def clamp(value: float) -> float:
+        return round(min(max(value, low), high), 2)
+
+    if distribution == "fixed":
+        return lambda: clamp(low)
+    if distribution == "uniform":
+        return lambda: clamp(rng.uniform(low, high))
+
+    # Exponencial: muitas doações pequenas, poucas grandes
+    mean = (low + high) / 4
+    return lambda: clamp(low + rng.expovariate(1 / mean))
+
+
+def classify_failure(error: Exception) -> str:
+    """Agrupa falhas pelo código de resultado do Horizon ou tipo da exceção
+
+    Falhas de operação incluem o código da operação (ex.:
+    `tx_failed/op_underfunded`), não só o da transação.
+    """
+    cause = error.__cause__ or error.__context__ or error
+
+    # Erros do Horizon (stellar_sdk.BaseHorizonError) trazem extras.result_codes
+    extras = getattr(cause, "extras", None) or {}
+    result_codes = extras.get("result_codes") or {}
+    codes = [result_codes["transaction"]] if result_codes.get("transaction") else []
+    codes += [c for c in result_codes.get("operations") or [] if c != "op_success"]
+
+    if not codes:
+        codes = RESULT_CODE_PATTERN.findall(str(error))
+
+    if codes:
+        return "/".join(dict.fromkeys(codes))
+    return type(cause).__name__
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Percentil pelo método nearest-rank"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, round(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+async def run_load(
+    service: StellarCrowdfundingService,
+    count: int,
+    concurrency: int = 1,
+    rate: float = 0.0,
+    distribution: str = "uniform",
+    min_amount: float = 1.0,
+    max_amount: float = 10.0,
+    seed: Optional[int] = None,
+) -> Dict:
+    """Dispara `count` doações sintéticas e mede vazão, latência e falhas
+
+    `concurrency` limita doações simultâneas e `rate` (doações/s, 0 = sem
+    limite) espaça o início de cada uma.
+    """
+    if count < 1:
+        raise ValueError("count deve ser pelo menos 1")
+    if concurrency < 1:
+        raise ValueError("concurrency deve ser pelo menos 1")
+    if rate < 0:
+        raise ValueError("rate não pode ser negativa (0 = sem limite)")
+    if min_amount > max_amount:
+        raise ValueError("min_amount não pode ser maior que max_amount")
+
+    rng = random.Random(seed)
+    sample_amount = make_amount_sampler(distribution, min_amount, max_amount, rng)
+    plan = [(synthetic_donor_name(i), sample_amount()) for i in range(count)]
+
+    latencies: List[float] = []
+    failures: Counter = Counter()
+    amount_donated = 0.0
+    next_index = 0
+
+    loop = asyncio.get_running_loop()
+    started_at = loop.time()
+
+    async def worker():
+        nonlocal next_index, amount_donated
+
+        while next_index < count:
+            index = next_index
+            next_index += 1
+
+            if rate > 0:
+                delay = started_at + index / rate - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+            donor_name, amount = plan[index]
+            sent_at = time.perf_counter()
+            try:
+                await service.process_donation(donor_name, amount)
+            except Exception as e:
+                failures[classify_failure(e)] += 1
+                continue
+
+            latencies.append((time.perf_counter() - sent_at) * 1000)
+            amount_donated += amount
+
+    await asyncio.gather(*(worker() for _ in range(min(concurrency, count))))
+
+    elapsed = loop.time() - started_at
+    latencies.sort()
+
+    return {
+        "requested": count,
+        "succeeded": len(latencies),
+        "failed": sum(failures.values()),
+        "amount_donated": round(amount_donated, 2),
+        "duration_seconds": round(elapsed, 3),
+        "achieved_tps": round(len(latencies) / elapsed, 3) if elapsed else 0.0,
+        "latency_ms": {
+            "mean": round(sum(latencies) / len(latencies), 1) if latencies else 0.0,
+            "p50": round(percentile(latencies, 50), 1),
+            "p90": round(percentile(latencies, 90), 1),
+            "p95": round(percentile(latencies, 95), 1),
+            "p99": round(percentile(latencies, 99), 1),
+            "max": round(latencies[-1], 1) if latencies else 0.0,
+        },
+        "failures": dict(failures.most_common()),
+        "parameters": {
+            "concurrency": concurrency,
+            "rate": rate,
+            "distribution": distribution,
+            "min_amount": min_amount,
+            "max_amount": max_amount,
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gerador de carga de doações")
+    parser.add_argument("--count", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument(
+        "--rate", type=float, default=0.0, help="Doações/s (0 = sem limite)"
+    )
+    parser.add_argument(
+        "--distribution", choices=AMOUNT_DISTRIBUTIONS, default="uniform"
+    )
+    parser.add_argument("--min-amount", type=float, default=1.0)
+    parser.add_argument("--max-amount", type=float, default=10.0)
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    async def run():
+        # Criado dentro do loop: o pool de contas de origem usa asyncio.Queue
+        service = StellarCrowdfundingService()
+        return await run_load(
+            service,
+            count=args.count,
+            concurrency=args.concurrency,
+            rate=args.rate,
+            distribution=args.distribution,
+            min_amount=args.min_amount,
+            max_amount=args.max_amount,
+            seed=args.seed,
+        )
+
+    report = asyncio.run(run())
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,13 @@
-from typing import Dict
+import asyncio
+from concurrent.futures import Executor
+from functools import partial
+from typing import TYPE_CHECKING, AsyncIterator, Dict, Optional
 
 from app.config import settings
-from app.utils.helpers import create_donation_memo
-from stellar_sdk import Asset, Keypair, Server, TransactionBuilder
+from app.utils.helpers import create_donation_memo, parse_donor_name
+
+if TYPE_CHECKING:
+    from stellar_sdk import Keypair
 
 
 class StellarCrowdfundingService:
@@ -12,31 +17,68 @@ class StellarCrowdfundingService:
         if not settings.DONOR_ACCOUNT_SECRET:
             raise ValueError("DONOR_ACCOUNT_SECRET não configurado")
 
+        # stellar_sdk é pesado de importar: só carrega quando o serviço é criado
+        from stellar_sdk import Keypair, Server
+        from stellar_sdk.client.requests_client import RequestsClient
+
         try:
-            self.server = Server(settings.HORIZON_URL)
+            self.server = Server(
+                settings.HORIZON_URL,
+                client=RequestsClient(pool_size=settings.HORIZON_POOL_SIZE),
+            )
             self.campaign_keypair = Keypair.from_secret(
                 settings.CAMPAIGN_ACCOUNT_SECRET
             )
             self.donor_keypair = Keypair.from_secret(settings.DONOR_ACCOUNT_SECRET)
+            self.channel_keypairs = [
+                Keypair.from_secret(secret)
+                for secret in settings.CHANNEL_ACCOUNT_SECRETS
+            ]
 
             print(f"(Success) Campanha configurada: {self.campaign_keypair.public_key}")
             print(
                 f"(Success) Conta doador configurada: {self.donor_keypair.public_key}"
             )
+            if self.channel_keypairs:
+                print(f"(Success) Contas de canal: {len(self.channel_keypairs)}")
 
         except Exception as e:
             raise ValueError(f"Erro nas chaves Stellar: {e}")
 
+        # Cada conta de origem submete uma transação por vez (número de sequência);
+        # sem contas de canal, todas as doações saem em série da conta doador
+        self._source_pool: asyncio.Queue = asyncio.Queue()
+        for keypair in self.channel_keypairs or [self.donor_keypair]:
+            self._source_pool.put_nowait(keypair)
+
+    def close(self):
+        """Fecha as conexões HTTP com o Horizon"""
+        self.server.close()
+
     async def process_donation(self, donor_name: str, amount: float) -> str:
         """Processa doação na blockchain Stellar"""
+        source_keypair = await self._source_pool.get()
         try:
-            donor_account = self.server.load_account(self.donor_keypair.public_key)
+            # Chamadas ao Horizon são bloqueantes: rodam fora do event loop
+            return await asyncio.to_thread(
+                self._submit_donation, source_keypair, donor_name, amount
+            )
+        finally:
+            self._source_pool.put_nowait(source_keypair)
+
+    def _submit_donation(
+        self, source_keypair: "Keypair", donor_name: str, amount: float
+    ) -> str:
+        from stellar_sdk import Asset, TransactionBuilder
+
+        try:
+            source_account = self.server.load_account(source_keypair.public_key)
 
             memo_text = create_donation_memo(donor_name, amount)
 
             transaction = (
                 TransactionBuilder(
-                    source_account=donor_account,
+                    source_account=source_account,
                     network_passphrase=settings.NETWORK_PASSPHRASE,
                     base_fee=100,
                 )
@@ -45,21 +87,27 @@ class StellarCrowdfundingService:
                     destination=self.campaign_keypair.public_key,
                     amount=str(amount),
                     asset=Asset.native(),
+                    source=self.donor_keypair.public_key,
                 )
                 .set_timeout(30)
                 .build()
             )
 
             transaction.sign(self.donor_keypair)
+            if source_keypair is not self.donor_keypair:
+                transaction.sign(source_keypair)
             response = self.server.submit_transaction(transaction)
 
             return response["hash"]
 
         except Exception as e:
-            raise Exception(f"Erro na transação Stellar: {str(e)}")
+            raise Exception(f"Erro na transação Stellar: {str(e)}") from e
 
     async def get_campaign_stats(self) -> Dict:
         """Calcula estatísticas da campanha baseado na blockchain"""
+        return await asyncio.to_thread(self._compute_campaign_stats)
+
+    def _compute_campaign_stats(self) -> Dict:
         try:
             transactions = (
                 self.server.transactions()
@@ -88,18 +136,10 @@ class StellarCrowdfundingService:
                             total_raised += amount
 
                             memo = tx.get("memo", "")
-                            donor_name = "Anônimo"
-
-                            if memo and ":" in memo:
-                                try:
-                                    parts = memo.split(":")
-                                    donor_name = parts[0] if parts[0] else "Anônimo"
-                                except:
-                                    pass
 
                             donations.append(
                                 {
-                                    "donor_name": donor_name,
+                                    "donor_name": parse_donor_name(memo),
                                     "amount": amount,
                                     "transaction_hash": tx["hash"],
                                     "timestamp": tx["created_at"],
@@ -136,6 +176,76 @@ class StellarCrowdfundingService:
                 "donors_count": 0,
             }
 
+    async def iter_donations(
+        self, since: Optional[str] = None, page_size: int = 200
+    ) -> AsyncIterator[Dict]:
+        """Percorre o histórico de doações em ordem cronológica"""
+        cursor = since
+        while True:
+            records = await self.get_payments_page(cursor, page_size)
+            if not records:
+                return
+
+            for record in records:
+                donation = self.payment_to_donation(record)
+                if donation:
+                    yield donation
+
+            cursor = records[-1]["paging_token"]
+            if len(records) < page_size:
+                return
+
+    async def get_payments_page(
+        self,
+        cursor: Optional[str],
+        limit: int,
+        desc: bool = False,
+        executor: Optional[Executor] = None,
+    ) -> list:
+        """Busca uma página de pagamentos da conta da campanha a partir do cursor
+
+        `executor` permite usar um pool de threads próprio (ex.: backfill) em vez
+        do executor padrão compartilhado com doações e estatísticas.
+        """
+        fetch = partial(self._fetch_payments_page, cursor, limit, desc)
+        if executor is None:
+            return await asyncio.to_thread(fetch)
+        return await asyncio.get_running_loop().run_in_executor(executor, fetch)
+
+    def _fetch_payments_page(
+        self, cursor: Optional[str], limit: int, desc: bool = False
+    ) -> list:
+        builder = (
+            self.server.payments()
+            .for_account(self.campaign_keypair.public_key)
+            .join("transactions")
+            .order(desc=desc)
+            .limit(limit)
+        )
+        if cursor:
+            builder = builder.cursor(cursor)
+        return builder.call()["_embedded"]["records"]
+
+    def payment_to_donation(self, op: Dict) -> Optional[Dict]:
+        """Converte um pagamento do Horizon em doação (None se não for doação)"""
+        if (
+            op["type"] != "payment"
+            or op["to"] != self.campaign_keypair.public_key
+            or op["asset_type"] != "native"
+        ):
+            return None
+
+        memo = op.get("transaction", {}).get("memo", "")
+        return {
+            "cursor": op["paging_token"],
+            "operation_id": op["id"],
+            "donor_name": parse_donor_name(memo),
+            "amount": float(op["amount"]),
+            "transaction_hash": op["transaction_hash"],
+            "timestamp": op["created_at"],
+            "memo": memo,
+        }
+
     def get_account_info(self, public_key: str) -> Dict:
         """Retorna informações de uma conta Stellar"""
         try:
@@ -23,6 +23,15 @@ def create_donation_memo(donor_name: str, amount: float) -> str:
     return memo
 
 
+def parse_donor_name(memo: str) -> str:
+    """Extrai o nome do doador de um memo no formato 'nome:valor'"""
+    if memo and ":" in memo:
+        name = memo.split(":")[0]
+        if name:
+            return name
+    return "Anônimo"
+
+
 def validate_donation_input(donor_name: str, amount: float) -> tuple[bool, str]:
     """Valida dados de entrada para doação"""
     if not donor_name or len(donor_name.strip()) < 2:
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Benchmark de inicialização da API (tempo de import e cold start)
+
+Cada medição roda em um interpretador novo. Compara com a referência
+versionada em benchmarks/startup_baseline.json e falha em caso de regressão
+(ou se stellar_sdk voltar a ser carregado no import de app.main).
+
+    python benchmarks/startup.py                  # mede e compara
+    python benchmarks/startup.py --save-baseline  # grava nova referência
+
+Atualize e versione a referência quando uma mudança intencional alterar o
+tempo de inicialização ou ao trocar a máquina de referência.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_PATH = os.path.join(BACKEND_DIR, "benchmarks", "startup_baseline.json")
+
+# Módulos que não podem ser carregados só por importar app.main
+LAZY_MODULES = ["stellar_sdk"]
+
+IMPORT_SCRIPT = """
+import json, sys, time
+started = time.perf_counter()
+import app.main
+elapsed = (time.perf_counter() - started) * 1000
+print(json.dumps({
+    "ms": elapsed,
+    "loaded": [m for m in %r if m in sys.modules],
+}))
+""" % (LAZY_MODULES,)
+
+# Import + lifespan + primeira resposta (sem tocar na rede Stellar)
+COLD_START_SCRIPT = """
+import json, time
+started = time.perf_counter()
+from fastapi.testclient import TestClient
+import app.main
+with TestClient(app.main.app) as client:
+    assert client.get("/").status_code == 200
+    elapsed = (time.perf_counter() - started) * 1000
+print(json.dumps({"ms": elapsed}))
+"""
+
+
+def run_sample(script):
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def measure(runs):
+    import_samples = [run_sample(IMPORT_SCRIPT) for _ in range(runs)]
+    cold_samples = [run_sample(COLD_START_SCRIPT) for _ in range(runs)]
+
+    return {
+        "import_ms": round(statistics.median(s["ms"] for s in import_samples), 1),
+        "cold_start_ms": round(statistics.median(s["ms"] for s in cold_samples), 1),
+        "eager_modules": sorted({m for s in import_samples for m in s["loaded"]}),
+        "python": platform.python_version(),
+        "machine": f"{platform.system()} {platform.machine()}",
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de inicialização")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="Piora máxima aceita em relação à referência (0.25 = 25%%)",
+    )
+    parser.add_argument("--save-baseline", action="store_true")
+    args = parser.parse_args()
+
+    results = measure(max(1, args.runs))
+    print(json.dumps(results, indent=2))
+
+    failures = []
+    if results["eager_modules"]:
+        failures.append(
+            f"Módulos carregados no import: {', '.join(results['eager_modules'])}"
+        )
+
+    if args.save_baseline:
+        with open(BASELINE_PATH, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+        print(f"💾 Referência salva em '{BASELINE_PATH}'")
+    elif not os.path.exists(BASELINE_PATH):
+        failures.append(
+            f"Referência ausente em '{BASELINE_PATH}' (gere com --save-baseline)"
+        )
+    else:
+        with open(BASELINE_PATH, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+        for key in ("python", "machine"):
+            if baseline.get(key) != results[key]:
+                print(
+                    f"⚠️  Referência medida em {key}={baseline.get(key)}, "
+                    f"atual {results[key]}: comparação aproximada"
+                )
+
+        for key in ("import_ms", "cold_start_ms"):
+            limit = baseline[key] * (1 + args.tolerance)
+            if results[key] > limit:
+                failures.append(
+                    f"{key}: {results[key]} ms (referência {baseline[key]} ms, "
+                    f"limite {limit:.1f} ms)"
+                )
+
+    if failures:
+        print("❌ Regressão de inicialização:")
+        for failure in failures:
+            print(f"   {failure}")
+        raise SystemExit(1)
+
+    print("✅ Inicialização dentro do esperado")
+
+
+if __name__ == "__main__":
+    main()
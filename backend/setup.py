@@ -3,11 +3,22 @@
 Configurador de Campanha para o Sistema de Vaquinha Stellar
 """
 
+import argparse
+import json
+import os
+import re
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
 
 import requests
+from requests.adapters import HTTPAdapter
 from stellar_sdk import Keypair
 
+FRIENDBOT_URL = "https://friendbot.stellar.org"
+HORIZON_URL = "https://horizon-testnet.stellar.org"
+NETWORK_PASSPHRASE = "Test SDF Network ; September 2015"
+
 
 def create_keypair():
     """Cria um novo par de chaves Stellar"""
@@ -15,21 +26,57 @@ def create_keypair():
     return {"public_key": kp.public_key, "secret_key": kp.secret}
 
 
-def fund_account(public_key):
-    """Financia conta na testnet"""
+def account_exists(public_key, session=None, horizon_url=HORIZON_URL):
+    """Verifica no Horizon se a conta já foi criada"""
+    http = session or requests
     try:
-        url = "https://friendbot.stellar.org"
-        response = requests.get(url, params={"addr": public_key}, timeout=15)
+        response = http.get(f"{horizon_url}/accounts/{public_key}", timeout=15)
+        return response.status_code == 200
+    except Exception:
+        return False
 
-        if response.status_code == 200:
-            print(f"✅ Conta financiada: {public_key[:8]}...{public_key[-8:]}")
+
+def fund_account(
+    public_key,
+    session=None,
+    friendbot_url=FRIENDBOT_URL,
+    retries=0,
+    horizon_url=HORIZON_URL,
+):
+    """Financia conta na testnet (com novas tentativas em falhas transitórias)"""
+    http = session or requests
+
+    for attempt in range(retries + 1):
+        # Uma tentativa anterior que expirou no cliente pode ter criado a conta
+        if attempt > 0 and account_exists(public_key, http, horizon_url):
+            print(f"✅ Conta já financiada: {public_key[:8]}...{public_key[-8:]}")
             return True
-        else:
+
+        try:
+            response = http.get(friendbot_url, params={"addr": public_key}, timeout=15)
+
+            if response.status_code == 200:
+                print(f"✅ Conta financiada: {public_key[:8]}...{public_key[-8:]}")
+                return True
+
+            # Friendbot responde 400 se a conta já existe
+            if 400 <= response.status_code < 500 and account_exists(
+                public_key, http, horizon_url
+            ):
+                print(f"✅ Conta já financiada: {public_key[:8]}...{public_key[-8:]}")
+                return True
+
             print(f"❌ Erro no financiamento: {response.status_code}")
-            return False
-    except Exception as e:
-        print(f"❌ Erro: {e}")
-        return False
+            # Erros 4xx (exceto 429) não se resolvem com nova tentativa
+            if 400 <= response.status_code < 500 and response.status_code != 429:
+                return False
+        except Exception as e:
+            print(f"❌ Erro: {e}")
+
+        if attempt < retries:
+            time.sleep(min(2**attempt, 30))
+
+    return False
 
 
 def get_campaign_details():
@@ -65,8 +112,15 @@ def get_campaign_details():
     return {"title": title, "description": description, "goal": goal}
 
 
-def create_env_file(campaign_keypair, donor_keypair, campaign_details):
-    """Cria arquivo .env com todas as configurações"""
+def build_env_content(
+    campaign_keypair,
+    donor_keypair,
+    campaign_details,
+    horizon_url=None,
+    network_passphrase=None,
+    channel_keypairs=None,
+):
+    """Monta o conteúdo do .env de uma campanha"""
 
     env_content = f"""# Configurações da Rede Stellar
 STELLAR_NETWORK=testnet
@@ -82,13 +136,217 @@ CAMPAIGN_GOAL_XLM={campaign_details["goal"]}
 CAMPAIGN_TITLE={campaign_details["title"]}
 CAMPAIGN_DESCRIPTION={campaign_details["description"]}"""
 
+    if horizon_url:
+        env_content += f"\n\nHORIZON_URL={horizon_url}"
+    if network_passphrase:
+        env_content += f"\nNETWORK_PASSPHRASE={network_passphrase}"
+    if channel_keypairs:
+        secrets = ",".join(kp["secret_key"] for kp in channel_keypairs)
+        env_content += "\n\n# Contas de canal (submissões paralelas)"
+        env_content += f"\nCHANNEL_ACCOUNT_SECRETS={secrets}"
+
+    return env_content
+
+
+def create_env_file(campaign_keypair, donor_keypair, campaign_details, path=".env"):
+    """Cria arquivo .env com todas as configurações"""
+    env_content = build_env_content(campaign_keypair, donor_keypair, campaign_details)
+
     # Salvar com codificação UTF-8
-    with open(".env", "w", encoding="utf-8", newline="\n") as f:
+    with open(path, "w", encoding="utf-8", newline="\n") as f:
         f.write(env_content)
 
     print("✅ Arquivo .env criado com sucesso!")
 
 
+def slugify(text):
+    slug = re.sub(r"[^a-zA-Z0-9]+", "-", text).strip("-").lower()
+    return slug or "campanha"
+
+
+def load_batch_spec(path):
+    """Lê o arquivo de especificação do modo batch
+
+    Formato (JSON):
+        {
+          "friendbot_url": "...",        (opcional)
+          "horizon_url": "...",          (opcional)
+          "network_passphrase": "...",   (opcional)
+          "channel_accounts": 0,         (padrão por campanha, opcional)
+          "campaigns": [
+            {"title": "...", "description": "...", "goal": 100.0,
+             "channel_accounts": 4, "name": "..."}
+          ]
+        }
+    """
+    with open(path, encoding="utf-8") as f:
+        spec = json.load(f)
+
+    campaigns = spec.get("campaigns")
+    if not campaigns:
+        raise ValueError("Especificação sem campanhas ('campaigns')")
+
+    default_channels = int(spec.get("channel_accounts", 0))
+    seen = set()
+    for i, campaign in enumerate(campaigns):
+        campaign.setdefault("title", f"Vaquinha {i + 1}")
+        campaign.setdefault("description", "Ajude nosso projeto!")
+        campaign["goal"] = float(campaign.get("goal", 100.0))
+        if campaign["goal"] <= 0:
+            raise ValueError(f"Meta inválida na campanha '{campaign['title']}'")
+        campaign["channel_accounts"] = int(
+            campaign.get("channel_accounts", default_channels)
+        )
+
+        name = slugify(campaign.get("name") or campaign["title"])
+        if name in seen:
+            name = f"{name}-{i + 1}"
+        seen.add(name)
+        campaign["name"] = name
+
+    return spec
+
+
+def provision_batch(
+    spec_path, output_dir, workers, retries, friendbot_url, horizon_url
+):
+    """Cria e financia em paralelo todas as contas descritas na especificação"""
+    spec = load_batch_spec(spec_path)
+    friendbot_url = friendbot_url or spec.get("friendbot_url") or FRIENDBOT_URL
+    horizon_url = horizon_url or spec.get("horizon_url") or HORIZON_URL
+    network_passphrase = spec.get("network_passphrase") or NETWORK_PASSPHRASE
+
+    plans = []
+    for campaign in spec["campaigns"]:
+        plans.append(
+            {
+                "details": {
+                    "title": campaign["title"],
+                    "description": campaign["description"],
+                    "goal": campaign["goal"],
+                },
+                "name": campaign["name"],
+                "campaign_keypair": create_keypair(),
+                "donor_keypair": create_keypair(),
+                "channel_keypairs": [
+                    create_keypair() for _ in range(campaign["channel_accounts"])
+                ],
+            }
+        )
+
+    public_keys = []
+    for plan in plans:
+        public_keys.append(plan["campaign_keypair"]["public_key"])
+        public_keys.append(plan["donor_keypair"]["public_key"])
+        public_keys.extend(kp["public_key"] for kp in plan["channel_keypairs"])
+
+    print(f"🚀 Provisionando {len(plans)} campanha(s), {len(public_keys)} conta(s)")
+    print(f"   Friendbot: {friendbot_url}")
+    print(f"   Workers: {workers}, tentativas extras: {retries}")
+
+    # Um único pool de conexões compartilhado entre as threads
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=workers)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    funded = {}
+    started_at = time.monotonic()
+    with session, ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(
+                fund_account, pk, session, friendbot_url, retries, horizon_url
+            ): pk
+            for pk in public_keys
+        }
+        for future in as_completed(futures):
+            funded[futures[future]] = future.result()
+
+    elapsed = time.monotonic() - started_at
+    failed = [pk for pk, ok in funded.items() if not ok]
+    print(
+        f"\n💰 {len(public_keys) - len(failed)}/{len(public_keys)} contas "
+        f"financiadas em {elapsed:.1f}s"
+    )
+
+    # Todas as configurações são escritas de uma vez, após o financiamento
+    os.makedirs(output_dir, exist_ok=True)
+    summary = []
+    for plan in plans:
+        env_path = os.path.join(output_dir, f"{plan['name']}.env")
+        env_content = build_env_content(
+            plan["campaign_keypair"],
+            plan["donor_keypair"],
+            plan["details"],
+            horizon_url=horizon_url,
+            network_passphrase=network_passphrase,
+            channel_keypairs=plan["channel_keypairs"],
+        )
+        with open(env_path, "w", encoding="utf-8", newline="\n") as f:
+            f.write(env_content)
+
+        accounts = [plan["campaign_keypair"], plan["donor_keypair"]]
+        accounts += plan["channel_keypairs"]
+        summary.append(
+            {
+                "name": plan["name"],
+                "env_file": env_path,
+                "campaign_details": plan["details"],
+                "campaign_keypair": plan["campaign_keypair"],
+                "donor_keypair": plan["donor_keypair"],
+                "channel_keypairs": plan["channel_keypairs"],
+                "funded": all(funded[kp["public_key"]] for kp in accounts),
+            }
+        )
+
+    info_path = os.path.join(output_dir, "campaigns_info.json")
+    with open(info_path, "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "campaigns": summary,
+                "friendbot_url": friendbot_url,
+                "horizon_url": horizon_url,
+                "network_passphrase": network_passphrase,
+                "created_at": datetime.now().isoformat(),
+            },
+            f,
+            indent=2,
+            ensure_ascii=False,
+        )
+
+    print(f"✅ {len(summary)} arquivo(s) .env criados em '{output_dir}'")
+    print(f"💾 Informações salvas em '{info_path}'")
+
+    if failed:
+        print(f"❌ {len(failed)} conta(s) não financiada(s):")
+        for pk in failed:
+            print(f"   {pk}")
+        return False
+
+    return True
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Configurador de Campanha Stellar")
+    parser.add_argument(
+        "--batch",
+        metavar="SPEC",
+        help="Modo não interativo: provisiona as campanhas do arquivo JSON",
+    )
+    parser.add_argument(
+        "--output-dir", default="campaigns", help="Diretório dos arquivos gerados"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=8, help="Financiamentos simultâneos"
+    )
+    parser.add_argument(
+        "--retries", type=int, default=3, help="Tentativas extras por conta"
+    )
+    parser.add_argument("--friendbot-url", help=f"Padrão: {FRIENDBOT_URL}")
+    parser.add_argument("--horizon-url", help=f"Padrão: {HORIZON_URL}")
+    return parser.parse_args()
+
+
 def main():
     print("🚀 Configurador de Campanha Stellar")
     print("=" * 50)
@@ -150,8 +408,6 @@ def main():
     print("3. Faça algumas doações para testar!")
 
     # Salvar informações em arquivo JSON
-    import json
-
     campaign_info = {
         "campaign_keypair": campaign_keypair,
         "donor_keypair": donor_keypair,
@@ -167,7 +423,17 @@ def main():
 
 
 if __name__ == "__main__":
-    import os
-    from datetime import datetime
+    args = parse_args()
+
+    if args.batch:
+        ok = provision_batch(
+            args.batch,
+            args.output_dir,
+            max(1, args.workers),
+            max(0, args.retries),
+            args.friendbot_url,
+            args.horizon_url,
+        )
+        raise SystemExit(0 if ok else 1)
 
     main()
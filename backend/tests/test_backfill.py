@@ -0,0 +1,63 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+from app.services.backfillService import LEDGER_SHIFT, run_backfill
+from app.services.donationIndex import DonationIndex
+from app.services.stellarService import StellarCrowdfundingService
+
+CAMPAIGN = "GCAMPANHA"
+
+
+class FakeHorizonService:
+    """Serviço com histórico de pagamentos em memória (sem rede)"""
+
+    payment_to_donation = StellarCrowdfundingService.payment_to_donation
+
+    def __init__(self, ledgers=range(100, 300), per_ledger=3):
+        self.campaign_keypair = SimpleNamespace(public_key=CAMPAIGN)
+        self.records = []
+        for ledger in ledgers:
+            for i in range(per_ledger):
+                token = str((ledger << LEDGER_SHIFT) + i + 1)
+                self.records.append(
+                    {
+                        "id": token,
+                        "paging_token": token,
+                        "type": "payment",
+                        # Um pagamento por ledger sai da campanha: não é doação
+                        "to": "GOUTRA" if i == 0 else CAMPAIGN,
+                        "asset_type": "native",
+                        "amount": "1.0000000",
+                        "transaction_hash": f"hash{token}",
+                        "created_at": "2024-01-01T00:00:00Z",
+                        "transaction": {"memo": f"Doador {token[-4:]}"},
+                    }
+                )
+
+    def _fetch(self, cursor, limit, desc):
+        time.sleep(0.001)
+        records = self.records[::-1] if desc else self.records
+        if cursor is not None:
+            records = [r for r in records if int(r["paging_token"]) > int(cursor)]
+        return records[:limit]
+
+    async def get_payments_page(self, cursor, limit, desc=False, executor=None):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, self._fetch, cursor, limit, desc)
+
+
+def test_inserted_matches_indexed_total_with_several_workers(tmp_path):
+    service = FakeHorizonService()
+    index = DonationIndex(str(tmp_path / "index.db"))
+    try:
+        report = asyncio.run(
+            run_backfill(service, index, workers=4, ranges_per_worker=2, page_size=20)
+        )
+    finally:
+        index.close()
+
+    assert report["errors"] == []
+    assert report["donations_found"] == 400
+    assert report["donations_inserted"] == report["indexed_total"] == 400
+    assert report["duplicates_skipped"] == 0